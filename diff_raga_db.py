@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import re
+from collections import Counter, defaultdict
+
+
+# -------------------------------------------------------
+# LOAD JS-AS-JSON (works for RagaDB.js and RagaDB_12.js)
+# -------------------------------------------------------
+def load_raga_db(path):
+    """
+    Load a generated RagaDB build.
+
+    Strips the "export const RagaDB =" / "export const RagaDB_12 =" prefix
+    and ignores anything after the object literal (e.g. the
+    "export default RagaDB_12;" line at the end of RagaDB_12.js).
+    Raises ValueError if the file is not a well-formed build.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    text = re.sub(r"^.*?RagaDB(?:_12)?\s*=\s*", "", text, count=1, flags=re.S)
+    try:
+        db, _ = json.JSONDecoder().raw_decode(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: not a valid RagaDB build ({e})") from e
+
+    if not isinstance(db, dict) or not all(isinstance(v, dict) for v in db.values()):
+        raise ValueError(f"{path}: not a valid RagaDB build (expected an object of raga entries)")
+    return db
+
+
+# -------------------------------------------------------
+# INDEXING
+# -------------------------------------------------------
+def variant_scales(name, vids, janya):
+    """
+    Resolve a melakarta's listed variant ids for one janya into an ordered
+    list of (variant_index, arohanam, avarohanam).
+
+    Variation ids are "<name><index>" (see extract_ragas_ultra_final.py),
+    so the index is whatever follows the janya name. Aro/ava are looked up
+    in the top-level janya entry and are None when no entry is passed (or
+    the variation is missing).
+    """
+    variations = janya.get("variations", {}) if janya else {}
+    out = []
+    for vid in vids:
+        idx = vid[len(name):] if vid.startswith(name) else vid
+        v = variations.get(vid) or {}
+        out.append((idx, v.get("arohanam"), v.get("avarohanam")))
+    return out
+
+
+def scale_key(variants):
+    """
+    Encode all variations' aro/ava into one hashable key (name-independent).
+    Returns None if any variation is unresolved, so those never pair up.
+    """
+    key = tuple((aro, ava) for _, aro, ava in variants)
+    if any(aro is None or ava is None for aro, ava in key):
+        return None
+    return key
+
+
+def index_db(db):
+    """
+    Split a RagaDB into:
+      melas:      { mela_name: (arohanam, avarohanam) }
+      listings:   { (mela_name, janya_name): [(variant_index, aro, ava), ...] }
+      parents:    { janya_name: top-level "parent" }
+      unresolved: [ (mela_name, janya_name), ... ]
+      unattributed: [ (mela_name, janya_name), ... ]
+
+    Listings come from each melakarta's "janyas" map rather than the
+    top-level janya entries: build_raga_db overwrites the top-level entry
+    when the same name appears under several melakartas, so only the
+    per-melakarta maps show every janya a block produced.
+
+    The top-level entry only holds the scale of the melakarta named in its
+    "parent", so other listings of that name get None for aro/ava and end
+    up in `unattributed`. Listings with no top-level entry end up in
+    `unresolved`.
+    """
+    melas = {}
+    listings = {}
+    parents = {}
+    unresolved = []
+    unattributed = []
+    for name, data in db.items():
+        if data.get("type") == "melakarta":
+            melas[name] = (data.get("arohanam", ""), data.get("avarohanam", ""))
+            for janya_name, vids in data.get("janyas", {}).items():
+                janya = db.get(janya_name)
+                if not janya or janya.get("type") != "janya":
+                    janya = None
+                    unresolved.append((name, janya_name))
+                elif janya.get("parent") != name:
+                    janya = None
+                    unattributed.append((name, janya_name))
+                listings[(name, janya_name)] = variant_scales(janya_name, vids, janya)
+        elif data.get("type") == "janya":
+            parents[name] = data.get("parent")
+    return melas, listings, parents, unresolved, unattributed
+
+
+# -------------------------------------------------------
+# DIFF
+# -------------------------------------------------------
+def diff_variants(old_variants, new_variants):
+    """Compare variations by index; report added/removed/changed ones."""
+    old_map = {idx: (aro, ava) for idx, aro, ava in old_variants}
+    new_map = {idx: (aro, ava) for idx, aro, ava in new_variants}
+    changes = []
+
+    for idx, (aro, ava) in old_map.items():
+        if idx not in new_map:
+            changes.append({"variant": idx, "status": "removed",
+                            "arohanam": aro, "avarohanam": ava})
+            continue
+        new_aro, new_ava = new_map[idx]
+        entry = {}
+        if aro != new_aro:
+            entry["arohanam"] = [aro, new_aro]
+        if ava != new_ava:
+            entry["avarohanam"] = [ava, new_ava]
+        if entry:
+            changes.append({"variant": idx, "status": "changed", **entry})
+
+    for idx, (aro, ava) in new_map.items():
+        if idx not in old_map:
+            changes.append({"variant": idx, "status": "added",
+                            "arohanam": aro, "avarohanam": ava})
+
+    return changes
+
+
+def match_moves(removed, added):
+    """
+    Pair removed and added listings of the same janya name under different
+    melakartas (membership moved from one melakarta to another).
+    """
+    old_by_name = defaultdict(list)
+    for mela, name in removed:
+        old_by_name[name].append(mela)
+
+    new_by_name = defaultdict(list)
+    for mela, name in added:
+        new_by_name[name].append(mela)
+
+    moves = []
+    for name in sorted(old_by_name.keys() & new_by_name.keys()):
+        for old_mela, new_mela in zip(sorted(old_by_name[name]), sorted(new_by_name[name])):
+            moves.append(((old_mela, name), (new_mela, name)))
+    return moves
+
+
+def _unique_pairs(removed, added, old_bucket, new_bucket):
+    """Pair listings whose bucket holds exactly one removed and one added entry."""
+    old_buckets = defaultdict(list)
+    for key in removed:
+        b = old_bucket(key)
+        if b is not None:
+            old_buckets[b].append(key)
+
+    new_buckets = defaultdict(list)
+    for key in added:
+        b = new_bucket(key)
+        if b is not None:
+            new_buckets[b].append(key)
+
+    pairs = []
+    for b, new_keys in new_buckets.items():
+        old_keys = old_buckets.get(b, [])
+        if len(old_keys) == 1 and len(new_keys) == 1:
+            pairs.append((old_keys[0], new_keys[0]))
+    return pairs
+
+
+def match_renames(removed, added, old_listings, new_listings):
+    """
+    Pair removed and added listings that have identical scales.
+
+    Listings are first bucketed by (melakarta, scale). A pair is only
+    reported when its bucket holds exactly one removed and one added
+    listing: many janyas share a scale, so anything ambiguous stays as a
+    plain removal + addition. What is left is then paired across
+    melakartas, but only when the scale occurs in exactly one listing of
+    each whole build (7-note scales carry no melakarta information, so
+    otherwise unrelated entries would pair up). A renamed janya whose
+    scale also changed, or whose scale is not attributable, is reported
+    as removed + added.
+    """
+    def by_mela(listings):
+        def bucket(key):
+            k = scale_key(listings[key])
+            return None if k is None else (key[0], k)
+        return bucket
+
+    def by_scale(listings):
+        counts = Counter(scale_key(v) for v in listings.values())
+
+        def bucket(key):
+            k = scale_key(listings[key])
+            return k if k is not None and counts[k] == 1 else None
+        return bucket
+
+    renames = _unique_pairs(removed, added,
+                            by_mela(old_listings), by_mela(new_listings))
+
+    paired_old = {o for o, _ in renames}
+    paired_new = {n for _, n in renames}
+    rest_removed = [k for k in removed if k not in paired_old]
+    rest_added = [k for k in added if k not in paired_new]
+
+    renames += _unique_pairs(rest_removed, rest_added,
+                             by_scale(old_listings), by_scale(new_listings))
+
+    return sorted(renames)
+
+
+def format_scale(scale):
+    """(aro, ava) -> "aro | ava" for the text report."""
+    if scale is None:
+        return "(none)"
+    aro, ava = scale
+    return f"{aro} | {ava}"
+
+
+def diff_raga_dbs(old_db, new_db):
+    """
+    Structural diff of two RagaDB builds. Runs in time linear in the
+    number of entries (plus sorting the output).
+
+    Janyas are compared per melakarta listing (mela, name), see index_db.
+
+    Returns a JSON-serialisable dict with:
+      melakartas_changed, janyas_added, janyas_removed, janyas_moved,
+      janyas_renamed, parents_moved, scales_changed, unresolved, summary
+
+    janyas_moved is a change of melakarta membership; parents_moved is a
+    change of the top-level "parent" field. `unresolved` and
+    `unattributed` list the new build's listings whose scale cannot be
+    read (see index_db); they are informational and do not by themselves
+    count as a difference. Scale changes are only reported for listings
+    whose scale is attributable on both sides.
+    """
+    old_melas, old_listings, old_parents, _, _ = index_db(old_db)
+    new_melas, new_listings, new_parents, new_unresolved, new_unattributed = index_db(new_db)
+
+    melas_changed = []
+    for name in sorted(old_melas.keys() | new_melas.keys()):
+        old = old_melas.get(name)
+        new = new_melas.get(name)
+        if old != new:
+            melas_changed.append({"name": name, "old": old, "new": new})
+
+    removed = sorted(old_listings.keys() - new_listings.keys())
+    added = sorted(new_listings.keys() - old_listings.keys())
+
+    moves = match_moves(removed, added)
+    moved_old = {o for o, _ in moves}
+    moved_new = {n for _, n in moves}
+    removed = [k for k in removed if k not in moved_old]
+    added = [k for k in added if k not in moved_new]
+
+    renames = match_renames(removed, added, old_listings, new_listings)
+    renamed_old = {o for o, _ in renames}
+    renamed_new = {n for _, n in renames}
+
+    janyas_removed = [
+        {"name": name, "parent": mela}
+        for mela, name in removed if (mela, name) not in renamed_old
+    ]
+    janyas_added = [
+        {"name": name, "parent": mela}
+        for mela, name in added if (mela, name) not in renamed_new
+    ]
+    janyas_moved = [
+        {"name": name, "old_parent": old_mela, "new_parent": new_mela}
+        for (old_mela, name), (new_mela, _) in moves
+    ]
+    janyas_renamed = [
+        {"old": old_name, "new": new_name,
+         "old_parent": old_mela, "new_parent": new_mela}
+        for (old_mela, old_name), (new_mela, new_name) in renames
+    ]
+
+    # Scale changes on listings present on both sides, and on moved ones,
+    # skipping any whose scale is not attributable on either side
+    scales_changed = []
+    compared = [(k, k) for k in old_listings.keys() & new_listings.keys()] + moves
+    for old_key, new_key in sorted(compared, key=lambda p: (p[1][1], p[1][0])):
+        old_variants = old_listings[old_key]
+        new_variants = new_listings[new_key]
+        if scale_key(old_variants) is None or scale_key(new_variants) is None:
+            continue
+        if old_variants != new_variants:
+            changes = diff_variants(old_variants, new_variants)
+            if changes:
+                scales_changed.append({"name": new_key[1], "parent": new_key[0],
+                                       "variants": changes})
+
+    parents_moved = []
+    for name in sorted(old_parents.keys() & new_parents.keys()):
+        if old_parents[name] != new_parents[name]:
+            parents_moved.append({"name": name, "old": old_parents[name],
+                                  "new": new_parents[name]})
+
+    result = {
+        "melakartas_changed": melas_changed,
+        "janyas_added": janyas_added,
+        "janyas_removed": janyas_removed,
+        "janyas_moved": janyas_moved,
+        "janyas_renamed": janyas_renamed,
+        "parents_moved": parents_moved,
+        "scales_changed": scales_changed,
+        "unresolved": [{"name": name, "parent": mela}
+                       for mela, name in sorted(new_unresolved)],
+        "unattributed": [{"name": name, "parent": mela}
+                         for mela, name in sorted(new_unattributed)],
+    }
+    result["summary"] = {key: len(val) for key, val in result.items()}
+    result["summary"]["old_listings"] = len(old_listings)
+    result["summary"]["new_listings"] = len(new_listings)
+    return result
+
+
+def has_changes(result):
+    """True if the result has anything to report (ignores summary/unresolved)."""
+    return any(v for k, v in result.items()
+               if k not in ("summary", "unresolved", "unattributed"))
+
+
+# -------------------------------------------------------
+# CORPUS PAIRING (file vs file, or dir vs dir by file name)
+# -------------------------------------------------------
+def pair_builds(old_path, new_path):
+    """
+    Return [(label, old_file, new_file), ...].
+
+    Two files are compared directly. Two directories are compared per
+    *.js file name (one build per book); a book present on only one side
+    gets None for the missing file. Mixing a file and a directory, or a
+    missing path, raises ValueError.
+    """
+    for path in (old_path, new_path):
+        if not os.path.exists(path):
+            raise ValueError(f"{path}: no such file or directory")
+
+    old_is_dir = os.path.isdir(old_path)
+    if old_is_dir != os.path.isdir(new_path):
+        raise ValueError(f"cannot compare a file with a directory: {old_path} vs {new_path}")
+
+    if old_is_dir:
+        old_files = {f for f in os.listdir(old_path) if f.endswith(".js")}
+        new_files = {f for f in os.listdir(new_path) if f.endswith(".js")}
+        return [
+            (f,
+             os.path.join(old_path, f) if f in old_files else None,
+             os.path.join(new_path, f) if f in new_files else None)
+            for f in sorted(old_files | new_files)
+        ]
+    return [(os.path.basename(new_path), old_path, new_path)]
+
+
+# -------------------------------------------------------
+# TEXT REPORT
+# -------------------------------------------------------
+def print_report(label, result):
+    if "build_added" in result:
+        print(f"== {label}: build added ({result['build_added']})")
+        return
+    if "build_removed" in result:
+        print(f"== {label}: build removed ({result['build_removed']})")
+        return
+
+    s = result["summary"]
+    print(f"== {label}: {s['old_listings']} -> {s['new_listings']} janya listings")
+    print(f"   added {s['janyas_added']}, removed {s['janyas_removed']}, "
+          f"moved {s['janyas_moved']}, renamed {s['janyas_renamed']}, "
+          f"parent field changes {s['parents_moved']}, "
+          f"scale changes {s['scales_changed']}, "
+          f"melakarta changes {s['melakartas_changed']}, "
+          f"unresolved {s['unresolved']}")
+
+    for m in result["melakartas_changed"]:
+        print(f"  ~ MELA {m['name']}: {format_scale(m['old'])} -> {format_scale(m['new'])}")
+    for j in result["janyas_added"]:
+        print(f"  + {j['name']} ({j['parent']})")
+    for j in result["janyas_removed"]:
+        print(f"  - {j['name']} ({j['parent']})")
+    for j in result["janyas_moved"]:
+        print(f"  = {j['name']}: {j['old_parent']} -> {j['new_parent']}")
+    for r in result["janyas_renamed"]:
+        moved = "" if r["old_parent"] == r["new_parent"] else \
+            f" [{r['old_parent']} -> {r['new_parent']}]"
+        print(f"  > {r['old']} -> {r['new']} ({r['new_parent']}){moved}")
+    for p in result["parents_moved"]:
+        print(f"  ^ {p['name']} parent field: {p['old']} -> {p['new']}")
+    for c in result["scales_changed"]:
+        for v in c["variants"]:
+            if v["status"] == "changed":
+                for field in ("arohanam", "avarohanam"):
+                    if field in v:
+                        old, new = v[field]
+                        print(f"  ~ {c['name']}#{v['variant']} ({c['parent']}) "
+                              f"{field}: {old} -> {new}")
+            else:
+                sign = "+" if v["status"] == "added" else "-"
+                print(f"  {sign} {c['name']}#{v['variant']} ({c['parent']}) "
+                      f"{v['arohanam']} | {v['avarohanam']}")
+    for j in result["unresolved"]:
+        print(f"  ? {j['parent']} -> {j['name']} (no top-level entry)")
+    if result["unattributed"]:
+        print(f"  ? {s['unattributed']} listings share a top-level entry filed under "
+              f"another melakarta; their scales are not compared")
+
+
+# -------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    args = [a for a in args if a != "--json"]
+
+    if len(args) != 2:
+        print("Usage: python3 diff_raga_db.py [--json] <old RagaDB.js|dir> <new RagaDB.js|dir>",
+              file=sys.stderr)
+        sys.exit(2)
+
+    # Exit codes: 0 = identical, 1 = builds differ, 2 = usage / load error
+    try:
+        pairs = pair_builds(args[0], args[1])
+        if not pairs:
+            print("[ERROR] No builds to compare", file=sys.stderr)
+            sys.exit(2)
+
+        results = {}
+        for label, old_file, new_file in pairs:
+            if old_file is None:
+                results[label] = {"build_added": new_file}
+            elif new_file is None:
+                results[label] = {"build_removed": old_file}
+            else:
+                results[label] = diff_raga_dbs(load_raga_db(old_file), load_raga_db(new_file))
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if as_json:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        for label, result in results.items():
+            print_report(label, result)
+
+    sys.exit(1 if any(has_changes(r) for r in results.values()) else 0)
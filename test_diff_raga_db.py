@@ -0,0 +1,165 @@
+import json
+import os
+import subprocess
+import sys
+
+from diff_raga_db import diff_raga_dbs, has_changes, pair_builds
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "diff_raga_db.py")
+
+
+# -------------------------------------------------------
+# TINY IN-MEMORY BUILDS
+# -------------------------------------------------------
+def mela(janyas):
+    """janyas: { name: [variant_id, ...] }"""
+    return {
+        "type": "melakarta",
+        "notes": "S R1 G1 M1 P D1 N1",
+        "arohanam": "S R1 G1 M1 P D1 N1 S",
+        "avarohanam": "S N1 D1 P M1 G1 R1 S",
+        "janyas": janyas,
+    }
+
+
+def janya(name, parent, *scales):
+    """scales: (aro, ava) per variation, numbered from 1."""
+    return {
+        "type": "janya",
+        "parent": parent,
+        "variations": {
+            f"{name}{i}": {"arohanam": aro, "avarohanam": ava}
+            for i, (aro, ava) in enumerate(scales, start=1)
+        },
+    }
+
+
+def build(*janyas):
+    """Build a DB from janya entries, listing each under its parent."""
+    db = {"Kanakangi": mela({}), "Ratnangi": mela({})}
+    for name, entry in janyas:
+        db[name] = entry
+        db[entry["parent"]]["janyas"][name] = list(entry["variations"])
+    return db
+
+
+SCALE_A = ("S R1 M1 P S", "S P M1 R1 S")
+SCALE_B = ("S G1 P D1 S", "S D1 P G1 S")
+
+
+# -------------------------------------------------------
+# DIFF
+# -------------------------------------------------------
+def test_identical_builds_have_no_changes():
+    db = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+    assert not has_changes(diff_raga_dbs(db, db))
+
+
+def test_move():
+    old = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+    new = build(("Foo", janya("Foo", "Ratnangi", SCALE_A)))
+    r = diff_raga_dbs(old, new)
+    assert r["janyas_moved"] == [
+        {"name": "Foo", "old_parent": "Kanakangi", "new_parent": "Ratnangi"}]
+    assert r["janyas_added"] == r["janyas_removed"] == []
+
+
+def test_rename_within_melakarta():
+    old = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+    new = build(("Bar", janya("Bar", "Kanakangi", SCALE_A)))
+    r = diff_raga_dbs(old, new)
+    assert r["janyas_renamed"] == [{"old": "Foo", "new": "Bar",
+                                    "old_parent": "Kanakangi", "new_parent": "Kanakangi"}]
+    assert r["janyas_added"] == r["janyas_removed"] == []
+
+
+def test_ambiguous_rename_bucket_does_not_pair():
+    old = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)),
+                ("Baz", janya("Baz", "Kanakangi", SCALE_A)))
+    new = build(("Bar", janya("Bar", "Kanakangi", SCALE_A)))
+    r = diff_raga_dbs(old, new)
+    assert r["janyas_renamed"] == []
+    assert [j["name"] for j in r["janyas_removed"]] == ["Baz", "Foo"]
+    assert [j["name"] for j in r["janyas_added"]] == ["Bar"]
+
+
+def test_cross_melakarta_rename_needs_build_wide_unique_scale():
+    # SCALE_A also belongs to an untouched janya, so Foo -> Bar must not pair
+    old = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)),
+                ("Keep", janya("Keep", "Kanakangi", SCALE_A)))
+    new = build(("Bar", janya("Bar", "Ratnangi", SCALE_A)),
+                ("Keep", janya("Keep", "Kanakangi", SCALE_A)))
+    assert diff_raga_dbs(old, new)["janyas_renamed"] == []
+
+    old = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+    new = build(("Bar", janya("Bar", "Ratnangi", SCALE_A)))
+    assert len(diff_raga_dbs(old, new)["janyas_renamed"]) == 1
+
+
+def test_variant_added_and_removed():
+    old = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+    new = build(("Foo", janya("Foo", "Kanakangi", SCALE_A, SCALE_B)))
+
+    r = diff_raga_dbs(old, new)
+    assert r["scales_changed"] == [{
+        "name": "Foo", "parent": "Kanakangi",
+        "variants": [{"variant": "2", "status": "added",
+                      "arohanam": SCALE_B[0], "avarohanam": SCALE_B[1]}],
+    }]
+
+    r = diff_raga_dbs(new, old)
+    assert r["scales_changed"][0]["variants"][0]["status"] == "removed"
+
+
+def test_duplicate_name_listing_is_not_a_scale_change():
+    # Foo is listed under both melakartas; the top-level entry (last
+    # writer) belongs to Ratnangi. A rebuild that drops the Ratnangi
+    # listing rewrites the entry with Kanakangi's scale.
+    old = build(("Foo", janya("Foo", "Ratnangi", SCALE_B)))
+    old["Kanakangi"]["janyas"]["Foo"] = ["Foo1"]
+    new = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+
+    r = diff_raga_dbs(old, new)
+    assert r["scales_changed"] == []
+    assert r["janyas_removed"] == [{"name": "Foo", "parent": "Ratnangi"}]
+    assert [j["parent"] for j in diff_raga_dbs(old, old)["unattributed"]] == ["Kanakangi"]
+
+
+# -------------------------------------------------------
+# CORPUS / CLI
+# -------------------------------------------------------
+def write_build(path, db):
+    path.write_text("export const RagaDB = " + json.dumps(db) + ";\n", encoding="utf-8")
+
+
+def run_cli(*args):
+    return subprocess.run([sys.executable, SCRIPT, *map(str, args)],
+                          capture_output=True, text=True)
+
+
+def test_pair_builds_book_on_one_side(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    db = build(("Foo", janya("Foo", "Kanakangi", SCALE_A)))
+    write_build(tmp_path / "a" / "book1.js", db)
+    write_build(tmp_path / "a" / "book2.js", db)
+    write_build(tmp_path / "b" / "book2.js", db)
+
+    pairs = pair_builds(str(tmp_path / "a"), str(tmp_path / "b"))
+    assert pairs[0] == ("book1.js", str(tmp_path / "a" / "book1.js"), None)
+    assert pairs[1][0] == "book2.js"
+
+    assert run_cli(tmp_path / "a", tmp_path / "b").returncode == 1
+    assert run_cli(tmp_path / "b", tmp_path / "b").returncode == 0
+
+
+def test_truncated_build_exits_2(tmp_path):
+    good = tmp_path / "good.js"
+    write_build(good, build(("Foo", janya("Foo", "Kanakangi", SCALE_A))))
+    bad = tmp_path / "bad.js"
+    bad.write_text(good.read_text(encoding="utf-8")[:60], encoding="utf-8")
+
+    proc = run_cli("--json", good, bad)
+    assert proc.returncode == 2
+    assert proc.stdout == ""
+    assert proc.stderr.startswith("[ERROR]")